@@ -5,15 +5,19 @@ Chat endpoints for BinBot
 from fastapi import APIRouter, HTTPException, UploadFile, File, Request, Query
 from pydantic import BaseModel
 from typing import Literal, Optional
+import asyncio
+import logging
+import re
 import tempfile
 import os
 from pathlib import Path
 from api_schemas import ChatResponse, ImageUploadResponse, ItemInput
+from config.settings import LLM_HISTORY_WINDOW
 from llm.client import get_gemini_client
+from llm.prompts import COMMAND_REMINDER, TTS_FORMAT_REMINDER, HELP_RESPONSE, TTS_HELP_RESPONSE
 from chat.function_wrappers import get_function_wrappers, create_function_mapping
 from session.session_manager import get_session_manager
-from storage.image_storage import get_image_storage
-from llm.vision import get_vision_service
+from api.images import store_and_analyze_upload
 from utils.logging import setup_logger
 
 # Set up logger for chat endpoint
@@ -21,16 +25,14 @@ logger = setup_logger(__name__)
 
 router = APIRouter()
 
+# Messages that are answered with fixed help text instead of an LLM call
+_HELP_RE = re.compile(r"^\s*(help|\?)\s*$", re.IGNORECASE)
 
-def create_function_mapping(wrappers):
-    """Create mapping between function names and wrapper methods"""
-    return {
-        "add_items": wrappers.add_items,
-        "search_items": wrappers.search_items,
-        "get_bin_contents": wrappers.get_bin_contents,
-        "move_items": wrappers.move_items,
-        "remove_items": wrappers.remove_items
-    }
+# Per-turn instructions appended to the current message, by response format
+_REMINDERS = {
+    "MD": COMMAND_REMINDER,
+    "TTS": COMMAND_REMINDER + TTS_FORMAT_REMINDER,
+}
 
 
 class ChatCommandRequest(BaseModel):
@@ -46,7 +48,9 @@ async def chat(
 ):
     """Chat with LLM using session-bound functions and automatic execution"""
     # Log request details for debugging
-    logger.info(f"CHAT_REQUEST: {request.method} {request.url} - Query params: {dict(request.query_params)} - Body fmt: {chat_request.fmt}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("CHAT_REQUEST: %s %s - Query params: %s - Body fmt: %s",
+                    request.method, request.url, dict(request.query_params), chat_request.fmt)
 
     # Get session ID from cookie
     session_id = request.cookies.get('session_id')
@@ -62,61 +66,81 @@ async def chat(
     # Use format from query parameter if provided, otherwise from request body
     response_format = fmt or chat_request.fmt
 
-    # Add user message to conversation with format-specific instructions
-    base_instructions = "\n\n The contents of any bin change at any time without your knowledge.  Remember to abide by system instructions.  Always use the tools provided whenever possible.  Never rely on your memory for bin contents.  ALWAYS use get_bin_contents to retrieve the contents of a bin."
-
-    if response_format == "TTS":
-        format_instructions = "\nRespond in a conversational, natural way suitable for text-to-speech. Keep responses short and avoid markdown formatting."
-    else:
-        format_instructions = ""  # No special instructions for MD format
-
-    full_message = chat_request.message + base_instructions + format_instructions
-    session_manager.add_message(session_id, "user", full_message)
+    # A help request is answered here without touching the history or the LLM
+    if _HELP_RE.match(chat_request.message):
+        help_text = TTS_HELP_RESPONSE if response_format == "TTS" else HELP_RESPONSE
+        return ChatResponse(success=True, response=help_text, current_bin=session.get('current_bin'))
+
+    # One turn at a time per session, so concurrent requests can't interleave
+    # their history and a resubmit waits for (and then reuses) the first answer
+    answered_turns_seen = session['answered_turns']
+    async with session['lock']:
+        # A duplicate submit that was waiting while the same message was answered gets
+        # that reply without another LLM call
+        recent = session_manager.get_recent_response(session_id, chat_request.message, response_format,
+                                                     answered_turns_seen)
+        if recent:
+            response_text, current_bin = recent
+            logger.info("CHAT_RESPONSE: %s... duplicate request, returning previous response", session_id[:8])
+            return ChatResponse(success=True, response=response_text, current_bin=current_bin)
+
+        # Add user message to conversation as typed. The session was looked up
+        # above, so the turn works on that dict instead of resolving it again
+        session_manager.append_message(session, "user", chat_request.message)
     
-    # Get conversation history
-    conversation = session_manager.get_conversation(session_id)
-
-    # Convert to LLM format
-    messages = []
-    for msg in conversation:
-        messages.append({
-            "role": msg["role"],
-            "content": msg["content"]
-        })
-
-    # Create session-bound function wrappers
-    wrappers = get_function_wrappers(session_id)
-    function_mapping = create_function_mapping(wrappers)
-
-    # Tools are now the actual Python functions (automatic function calling)
-    tools = list(function_mapping.values())
+        # Get conversation history; only a recent window is sent so prompt size
+        # stays flat as the session grows. The stored messages are passed as-is
+        # (the LLM client only reads role and content)
+        messages = session['conversation'][-LLM_HISTORY_WINDOW:]
+        image_context = session['image_context']
+        if image_context and not any(msg is image_context[-1] for msg in messages):
+            messages = [*image_context, *messages]
+
+        # Format-specific instructions go on the current turn only, so they are
+        # sent once per request instead of once per remembered message. That turn
+        # is replaced by a copy so the stored message stays as typed
+        current = messages[-1]
+        messages[-1] = {
+            "role": current["role"],
+            "content": current["content"] + _REMINDERS["TTS" if response_format == "TTS" else "MD"]
+        }
+
+        # Tools are the session-bound wrapper methods (automatic function calling),
+        # built on the session's first chat turn and reused after that
+        tools = session['tools']
+        if tools is None:
+            wrappers = get_function_wrappers(session_id)
+            tools = session['tools'] = list(create_function_mapping(wrappers).values())
     
-    # Get LLM client and send chat
-    llm_client = get_gemini_client()
+        # Get LLM client and send chat
+        llm_client = get_gemini_client()
 
-    try:
-        # Send to LLM with automatic function calling enabled
-        response_text = llm_client.chat_completion(messages, tools, response_format)
+        try:
+            # Send to LLM with automatic function calling enabled. The call blocks for the
+            # whole round trip (including tool calls), so it runs in a worker thread to
+            # keep the event loop free for other requests
+            response_text = await asyncio.to_thread(llm_client.chat_completion, messages, tools, response_format)
 
-        # Add model response to conversation
-        session_manager.add_message(session_id, "model", response_text)
+            # Add model response to conversation
+            session_manager.append_message(session, "model", response_text)
 
-        # Get current bin from session after function calls may have updated it
-        updated_session = session_manager.get_session(session_id)
-        current_bin = updated_session.get('current_bin') if updated_session else None
+            # Get current bin from session after function calls may have updated it
+            current_bin = session.get('current_bin')
 
-        logger.info(f"CHAT_RESPONSE: {session_id[:8]}... returning current_bin='{current_bin}'")
-        return ChatResponse(success=True, response=response_text, current_bin=current_bin)
+            session_manager.remember_response(session_id, chat_request.message, response_format,
+                                              response_text, current_bin)
 
-    except Exception as e:
-        error_msg = f"Chat error: {str(e)}"
-        session_manager.add_message(session_id, "model", error_msg)
+            logger.info("CHAT_RESPONSE: %s... returning current_bin='%s'", session_id[:8], current_bin)
+            return ChatResponse(success=True, response=response_text, current_bin=current_bin)
 
-        # Still include current_bin even on error
-        session = session_manager.get_session(session_id)
-        current_bin = session.get('current_bin') if session else None
+        except Exception as e:
+            error_msg = f"Chat error: {str(e)}"
+            session_manager.append_message(session, "model", error_msg)
 
-        return ChatResponse(success=False, response=error_msg, current_bin=current_bin)
+            # Still include current_bin even on error
+            current_bin = session.get('current_bin')
+
+            return ChatResponse(success=False, response=error_msg, current_bin=current_bin)
 
 
 @router.post("/api/chat/image", response_model=ImageUploadResponse)
@@ -127,7 +151,9 @@ async def chat_image(
 ):
     """Upload image, analyze contents, and add to session context"""
     # Log request details for debugging
-    logger.info(f"IMAGE_REQUEST: {request.method} {request.url} - Query params: {dict(request.query_params)} - File: {file.filename}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("IMAGE_REQUEST: %s %s - Query params: %s - File: %s",
+                    request.method, request.url, dict(request.query_params), file.filename)
 
     # Get session ID from cookie
     session_id = request.cookies.get('session_id')
@@ -150,37 +176,31 @@ async def chat_image(
         temp_path = temp_file.name
     
     try:
-        # Store image
-        print(f"📁 Storing image: {file.filename}")
-        image_storage = get_image_storage()
-        image_id = image_storage.save_image(temp_path, file.filename)
+        # Store and analyze the image concurrently; neither needs the other's result
+        print(f"📁 Storing image and 👁️ analyzing with vision service: {file.filename}")
+        image_id, analyzed_items_data = await store_and_analyze_upload(temp_path, file.filename, content)
         print(f"✅ Image stored with ID: {image_id}")
-
-        # Analyze image for items
-        print(f"👁️ Analyzing image with vision service...")
-        vision_service = get_vision_service()
-        analyzed_items_data = vision_service.analyze_image(temp_path)
         print(f"✅ Vision analysis complete: {len(analyzed_items_data)} items found")
         
         # Convert to ItemInput format
-        analyzed_items = []
-        for item_data in analyzed_items_data:
-            item = ItemInput(
-                name=item_data.get('name', ''),
-                description=item_data.get('description', ''),
-                image_id=image_id
-            )
-            analyzed_items.append(item)
+        analyzed_items = [
+            ItemInput(name=item_data.get('name', ''), description=item_data.get('description', ''), image_id=image_id)
+            for item_data in analyzed_items_data
+        ]
         
         # Add image analysis to session context with proper image UUID and full details
-        analysis_summary = f"Image uploaded and analyzed (image_id: {image_id}). Found {len(analyzed_items)} items:\n"
-        for item in analyzed_items:
-            analysis_summary += f"- Name: '{item.name}', Description: '{item.description}', Image ID: '{image_id}'\n"
-
-        analysis_summary += f"\nWhen adding these items to a bin, use the exact image_id '{image_id}' and include both name and description for each item."
-
-        session_manager.add_message(session_id, "user", f"[Image uploaded: {file.filename}]")
-        session_manager.add_message(session_id, "model", analysis_summary)
+        analysis_summary = "".join([
+            f"Image uploaded and analyzed (image_id: {image_id}). Found {len(analyzed_items)} items:\n",
+            *(f"- Name: '{item.name}', Description: '{item.description}', Image ID: '{image_id}'\n"
+              for item in analyzed_items),
+            f"\nWhen adding these items to a bin, use the exact image_id '{image_id}' and include both name and description for each item."
+        ])
+
+        # Wait out any in-flight chat turn so the upload can't land between its messages
+        async with session['lock']:
+            session_manager.append_message(session, "user", f"[Image uploaded: {file.filename}]")
+            session_manager.append_message(session, "model", analysis_summary)
+            session['image_context'] = tuple(session['conversation'][-2:])
 
         # Generate format-appropriate conversational response
         if fmt == "TTS":
@@ -202,10 +222,11 @@ async def chat_image(
             if len(analyzed_items) == 0:
                 conversational_response = "## 📷 Image Analysis Complete\n\n**No items found** in the uploaded image."
             else:
-                conversational_response = f"## 📷 Image Analysis Complete\n\n**Found {len(analyzed_items)} item{'s' if len(analyzed_items) != 1 else ''}:**\n\n"
-                for item in analyzed_items:
-                    conversational_response += f"- **{item.name}**: {item.description}\n"
-                conversational_response += f"\n*Ready to add to inventory when you specify a bin.*"
+                conversational_response = "".join([
+                    f"## 📷 Image Analysis Complete\n\n**Found {len(analyzed_items)} item{'s' if len(analyzed_items) != 1 else ''}:**\n\n",
+                    *(f"- **{item.name}**: {item.description}\n" for item in analyzed_items),
+                    "\n*Ready to add to inventory when you specify a bin.*"
+                ])
 
         return ImageUploadResponse(
             success=True,
@@ -219,7 +240,8 @@ async def chat_image(
         print(f"❌ Image upload error: {error_msg}")
         import traceback
         traceback.print_exc()
-        session_manager.add_message(session_id, "model", error_msg)
+        async with session['lock']:
+            session_manager.append_message(session, "model", error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
         
     finally:
@@ -4,15 +4,54 @@ Image management endpoints for BinBot
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from fastapi.responses import Response
+import asyncio
 import tempfile
 import os
 from pathlib import Path
+from typing import Dict, List, Tuple
 from api_schemas import ImageUploadResponse, ImageAnalysisRequest, ItemInput
 from storage.image_storage import get_image_storage
 from llm.vision import get_vision_service
+from utils.logging import setup_logger
+
+# Set up logger for image endpoints
+logger = setup_logger(__name__)
 
 router = APIRouter()
 
+# Content types for served images by file extension; anything else is served as JPEG
+_MEDIA_TYPES = {'.png': 'image/png', '.gif': 'image/gif'}
+
+
+def _media_type(filename: str) -> str:
+    """Content type for an image based on its file extension"""
+    return _MEDIA_TYPES.get(os.path.splitext(filename)[1].lower(), "image/jpeg")
+
+
+async def store_and_analyze_upload(temp_path: str, filename: str, content: bytes) -> Tuple[str, List[Dict[str, str]]]:
+    """Store an uploaded image and analyze it concurrently, keeping neither if one fails"""
+    image_storage = get_image_storage()
+    save_task = asyncio.create_task(asyncio.to_thread(image_storage.save_image, temp_path, filename))
+    analysis_task = asyncio.create_task(get_vision_service().analyze_image_bytes_async(content))
+
+    try:
+        image_id = await save_task
+    except BaseException:
+        # Analysis of an image that could not be stored would be wasted
+        analysis_task.cancel()
+        if analysis_task.done() and not analysis_task.cancelled() and analysis_task.exception():
+            logger.error("Image analysis also failed: %s", analysis_task.exception())
+        raise
+
+    try:
+        analyzed_items_data = await analysis_task
+    except BaseException:
+        # The save has finished by now, so the stored copy can be removed
+        await asyncio.to_thread(image_storage.delete_image, image_id)
+        raise
+
+    return image_id, analyzed_items_data
+
 
 @router.post("/api/images", response_model=ImageUploadResponse)
 async def upload_image(file: UploadFile = File(...)):
@@ -27,23 +66,14 @@ async def upload_image(file: UploadFile = File(...)):
         temp_path = temp_file.name
     
     try:
-        # Store image
-        image_storage = get_image_storage()
-        image_id = image_storage.save_image(temp_path, file.filename)
-        
-        # Analyze image for items
-        vision_service = get_vision_service()
-        analyzed_items_data = vision_service.analyze_image(temp_path)
+        # Store and analyze the image concurrently; neither needs the other's result
+        image_id, analyzed_items_data = await store_and_analyze_upload(temp_path, file.filename, content)
         
         # Convert to ItemInput format
-        analyzed_items = []
-        for item_data in analyzed_items_data:
-            item = ItemInput(
-                name=item_data.get('name', ''),
-                description=item_data.get('description', ''),
-                image_id=image_id
-            )
-            analyzed_items.append(item)
+        analyzed_items = [
+            ItemInput(name=item_data.get('name', ''), description=item_data.get('description', ''), image_id=image_id)
+            for item_data in analyzed_items_data
+        ]
         
         return ImageUploadResponse(
             success=True,
@@ -67,22 +97,12 @@ async def analyze_image(image_id: str, request: ImageAnalysisRequest):
     if not image_metadata:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Get image path or data
-    if hasattr(image_storage, 'get_image_data') and image_storage.get_image_data(image_id):
-        # In-memory mode - need to create temporary file
-        image_data = image_storage.get_image_data(image_id)
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
-            temp_file.write(image_data)
-            temp_path = temp_file.name
-        
-        try:
-            # Analyze image
-            vision_service = get_vision_service()
-            analyzed_items_data = vision_service.analyze_image(temp_path)
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+    # Get image path or data (stored bytes are only present in in-memory mode)
+    image_data = image_storage.get_image_data(image_id)
+    if image_data:
+        # In-memory mode - analyze the stored bytes directly
+        vision_service = get_vision_service()
+        analyzed_items_data = await vision_service.analyze_image_bytes_async(image_data)
     else:
         # File mode
         image_path = image_storage.get_image_path(image_id)
@@ -91,17 +111,13 @@ async def analyze_image(image_id: str, request: ImageAnalysisRequest):
         
         # Analyze image
         vision_service = get_vision_service()
-        analyzed_items_data = vision_service.analyze_image(image_path)
+        analyzed_items_data = await vision_service.analyze_image_async(image_path)
     
     # Convert to ItemInput format
-    analyzed_items = []
-    for item_data in analyzed_items_data:
-        item = ItemInput(
-            name=item_data.get('name', ''),
-            description=item_data.get('description', ''),
-            image_id=image_id
-        )
-        analyzed_items.append(item)
+    analyzed_items = [
+        ItemInput(name=item_data.get('name', ''), description=item_data.get('description', ''), image_id=image_id)
+        for item_data in analyzed_items_data
+    ]
     
     return ImageUploadResponse(
         success=True,
@@ -120,19 +136,11 @@ async def get_image(image_id: str):
     if not image_metadata:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Get image data
-    if hasattr(image_storage, 'get_image_data') and image_storage.get_image_data(image_id):
-        # In-memory mode
-        image_data = image_storage.get_image_data(image_id)
-        
-        # Determine content type from filename
-        filename = image_metadata.get('filename', '')
-        if filename.lower().endswith('.png'):
-            media_type = "image/png"
-        elif filename.lower().endswith('.gif'):
-            media_type = "image/gif"
-        else:
-            media_type = "image/jpeg"
+    # Get image data (stored bytes are only present in in-memory mode)
+    image_data = image_storage.get_image_data(image_id)
+    if image_data:
+        # In-memory mode - determine content type from filename
+        media_type = _media_type(image_metadata.get('filename', ''))
         
         return Response(content=image_data, media_type=media_type)
     else:
@@ -146,12 +154,6 @@ async def get_image(image_id: str):
             image_data = f.read()
         
         # Determine content type from file extension
-        path = Path(image_path)
-        if path.suffix.lower() == '.png':
-            media_type = "image/png"
-        elif path.suffix.lower() == '.gif':
-            media_type = "image/gif"
-        else:
-            media_type = "image/jpeg"
+        media_type = _media_type(image_path)
         
         return Response(content=image_data, media_type=media_type)
@@ -5,6 +5,7 @@ Inventory management endpoints for BinBot
 from fastapi import APIRouter, HTTPException
 from typing import List
 from datetime import datetime
+import asyncio
 import uuid
 
 from api_schemas import (
@@ -23,23 +24,24 @@ def add_items_logic(bin_id: str, items: List[ItemInput]) -> SuccessResponse:
     db_client = get_chromadb_client()
     embedding_service = get_embedding_service()
 
-    # Prepare items for database
-    items_to_add = []
-    for item_input in items:
-        # Generate embedding for the item
-        item_text = item_input.name
-        if item_input.description:
-            item_text += f" {item_input.description}"
-
-        embedding = embedding_service.generate_embedding(item_text)
+    # Generate embeddings for all items in one batched request
+    item_texts = [
+        f"{item_input.name} {item_input.description}" if item_input.description else item_input.name
+        for item_input in items
+    ]
+    embeddings = embedding_service.batch_generate_embeddings(item_texts)
 
+    # Prepare items for database; one timestamp covers the whole batch
+    created_at = datetime.now().isoformat()
+    items_to_add = []
+    for item_input, embedding in zip(items, embeddings):
         # Create item document
         item_doc = {
             'id': str(uuid.uuid4()),
             'name': item_input.name,
             'description': item_input.description or '',
             'bin_id': bin_id,
-            'created_at': datetime.now().isoformat(),
+            'created_at': created_at,
             'image_id': item_input.image_id or '',
             'embedding': embedding
         }
@@ -59,8 +61,7 @@ def remove_items_logic(item_ids: List[str], bin_id: str = "") -> SuccessResponse
     db_client = get_chromadb_client()
 
     # Remove items from database
-    for item_id in item_ids:
-        db_client.remove_document(item_id)
+    db_client.remove_documents_bulk(item_ids)
 
     message = f"Successfully removed {len(item_ids)} items"
     if bin_id:
@@ -77,8 +78,7 @@ def move_items_logic(item_ids: List[str], target_bin_id: str) -> SuccessResponse
     db_client = get_chromadb_client()
 
     # Move items to target bin
-    for item_id in item_ids:
-        db_client.update_item_bin(item_id, target_bin_id)
+    db_client.update_items_bin_bulk(item_ids, target_bin_id)
 
     return SuccessResponse(
         success=True,
@@ -91,19 +91,9 @@ def search_items_logic(query: str, limit: int = 10) -> ItemsResponse:
     db_client = get_chromadb_client()
     search_results = db_client.search_documents(query, limit)
 
-    # Convert to API format
-    items = []
-    for item_data in search_results:
-        item = Item(
-            id=item_data['id'],
-            name=item_data['name'],
-            description=item_data.get('description', ''),
-            bin_id=item_data['bin_id'],
-            created_at=item_data['created_at'],
-            image_id=item_data.get('image_id', ''),
-            confidence_score=item_data.get('confidence_score')
-        )
-        items.append(item)
+    # Convert to API format; the database layer already fills every Item field
+    # (extra keys like 'distance' are ignored by the model)
+    items = [Item.model_validate(item_data) for item_data in search_results]
 
     return ItemsResponse(
         success=True,
@@ -117,19 +107,9 @@ def get_bin_contents_logic(bin_id: str) -> BinContentsResponse:
     db_client = get_chromadb_client()
     bin_items = db_client.get_bin_contents(bin_id)
 
-    # Convert to API format
-    items = []
-    for item_data in bin_items:
-        item = Item(
-            id=item_data['id'],
-            name=item_data['name'],
-            description=item_data.get('description', ''),
-            bin_id=item_data['bin_id'],
-            created_at=item_data['created_at'],
-            image_id=item_data.get('image_id', ''),
-            confidence_score=item_data.get('confidence_score')
-        )
-        items.append(item)
+    # Convert to API format; the database layer already fills every Item field
+    # (extra keys like 'distance' are ignored by the model)
+    items = [Item.model_validate(item_data) for item_data in bin_items]
 
     return BinContentsResponse(
         success=True,
@@ -143,7 +123,8 @@ def get_bin_contents_logic(bin_id: str) -> BinContentsResponse:
 async def add_items(request: AddItemsRequest):
     """Add items to a bin"""
     try:
-        return add_items_logic(request.bin_id, request.items)
+        # Embedding the items is a blocking API call; keep it off the event loop
+        return await asyncio.to_thread(add_items_logic, request.bin_id, request.items)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add items: {str(e)}")
 
@@ -170,7 +151,8 @@ async def move_items(request: MoveItemsRequest):
 async def search_items(request: SearchRequest):
     """Search for items in inventory"""
     try:
-        return search_items_logic(request.query, request.limit or 10)
+        # Embedding the query is a blocking API call; keep it off the event loop
+        return await asyncio.to_thread(search_items_logic, request.query, request.limit or 10)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to search items: {str(e)}")
 
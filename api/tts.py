@@ -6,7 +6,7 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import Response
 from pydantic import BaseModel
 import httpx
-import asyncio
+import orjson
 from typing import Literal
 
 from config.settings import OPENAI_API_KEY
@@ -17,6 +17,28 @@ logger = setup_logger(__name__)
 
 router = APIRouter()
 
+# Shared HTTP client so TTS requests reuse keep-alive connections to OpenAI
+# instead of paying a new TCP and TLS handshake on every call
+_http_client = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for OpenAI calls, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client and its pooled connections (called at app shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
 
 class TTSRequest(BaseModel):
     text: str
@@ -28,7 +50,7 @@ class TTSRequest(BaseModel):
 async def text_to_speech(request: TTSRequest):
     """Convert text to speech using OpenAI TTS API"""
 
-    logger.info(f"TTS request: text='{request.text[:50]}...', voice={request.voice}, model={request.model}")
+    logger.info("TTS request: text='%.50s...', voice=%s, model=%s", request.text, request.voice, request.model)
 
     if not OPENAI_API_KEY:
         logger.error("OpenAI API key not configured")
@@ -41,50 +63,50 @@ async def text_to_speech(request: TTSRequest):
     try:
         logger.info("Calling OpenAI TTS API...")
         # Call OpenAI TTS API
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/audio/speech",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": request.model,
-                    "input": request.text,
-                    "voice": request.voice,
-                    "response_format": "mp3"
-                },
-                timeout=30.0
-            )
-            
-            if response.status_code != 200:
-                error_detail = f"OpenAI API error: {response.status_code}"
-                try:
-                    error_json = response.json()
-                    error_detail = error_json.get("error", {}).get("message", error_detail)
-                    logger.error(f"OpenAI API error response: {error_json}")
-                except Exception as e:
-                    logger.error(f"Failed to parse OpenAI error response: {e}")
-                logger.error(f"OpenAI TTS API failed: {error_detail}")
-                raise HTTPException(status_code=500, detail=error_detail)
-            
-            # Return audio data as MP3
-            logger.info(f"TTS successful, returning {len(response.content)} bytes of audio")
-            return Response(
-                content=response.content,
-                media_type="audio/mpeg",
-                headers={
-                    "Content-Disposition": "inline; filename=speech.mp3",
-                    "Cache-Control": "no-cache"
-                }
-            )
-            
+        client = _get_http_client()
+        response = await client.post(
+            "https://api.openai.com/v1/audio/speech",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            content=orjson.dumps({
+                "model": request.model,
+                "input": request.text,
+                "voice": request.voice,
+                "response_format": "mp3"
+            }),
+            timeout=30.0
+        )
+        
+        if response.status_code != 200:
+            error_detail = f"OpenAI API error: {response.status_code}"
+            try:
+                error_json = response.json()
+                error_detail = error_json.get("error", {}).get("message", error_detail)
+                logger.error("OpenAI API error response: %s", error_json)
+            except Exception as e:
+                logger.error("Failed to parse OpenAI error response: %s", e)
+            logger.error("OpenAI TTS API failed: %s", error_detail)
+            raise HTTPException(status_code=500, detail=error_detail)
+        
+        # Return audio data as MP3
+        logger.info("TTS successful, returning %d bytes of audio", len(response.content))
+        return Response(
+            content=response.content,
+            media_type="audio/mpeg",
+            headers={
+                "Content-Disposition": "inline; filename=speech.mp3",
+                "Cache-Control": "no-cache"
+            }
+        )
+        
     except httpx.TimeoutException:
         logger.error("OpenAI API timeout")
         raise HTTPException(status_code=504, detail="OpenAI API timeout")
     except httpx.RequestError as e:
-        logger.error(f"HTTP request failed: {str(e)}")
+        logger.error("HTTP request failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Request failed: {str(e)}")
     except Exception as e:
-        logger.error(f"Unexpected TTS error: {str(e)}")
+        logger.error("Unexpected TTS error: %s", e)
         raise HTTPException(status_code=500, detail=f"TTS generation failed: {str(e)}")
@@ -2,6 +2,7 @@
 BinBot FastAPI Application
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -13,7 +14,14 @@ from api.session import router as session_router
 from api.inventory import router as inventory_router
 from api.images import router as images_router
 from api.chat import router as chat_router
-from api.tts import router as tts_router
+from api.tts import router as tts_router, close_http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared network clients when the app shuts down"""
+    yield
+    await close_http_client()
 
 
 def create_app() -> FastAPI:
@@ -22,7 +30,8 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="BinBot API",
         description="AI-assisted inventory management system",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
     
     # Configure CORS
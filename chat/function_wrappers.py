@@ -2,9 +2,11 @@
 Simple function wrappers for LLM function calling
 """
 
-import json
+import logging
 from typing import List, Dict, Any
 
+import orjson
+
 from api.inventory import (
     add_items_logic, remove_items_logic, move_items_logic,
     search_items_logic, get_bin_contents_logic
@@ -17,6 +19,9 @@ from utils.logging import setup_logger
 # Add constant at top of file
 ENABLE_FUNCTION_LOGGING = False
 
+# Wrapper methods exposed to the LLM as tools
+INVENTORY_FUNCTION_NAMES = ("add_items", "search_items", "get_bin_contents", "move_items", "remove_items")
+
 # Set up logger for function wrappers
 logger = setup_logger(__name__)
 
@@ -36,12 +41,22 @@ class InventoryFunctionWrappers:
             
         try:
             # Add to conversation history as a model message (Gemini only accepts 'user' and 'model' roles)
-            log_message = f"FUNCTION_CALL: {function_name}({', '.join(f'{k}={v}' for k, v in args.items())})\nRESPONSE: {json.dumps(response, indent=2)}"
+            # Compact JSON: this text is replayed to the LLM, so indentation only costs tokens
+            log_message = f"FUNCTION_CALL: {function_name}({', '.join(f'{k}={v}' for k, v in args.items())})\nRESPONSE: {orjson.dumps(response).decode()}"
             self.session_manager.add_message(self.session_id, "model", log_message)
 
         except Exception as e:
-            logger.error(f"Failed to log function call {function_name}: {e}")
+            logger.error("Failed to log function call %s: %s", function_name, e)
     
+    def _error_response(self, function_name: str, args: Dict[str, Any], error_result: str,
+                        error_response: Dict[str, Any]) -> Dict[str, Any]:
+        """Log a failed function call and return its error response"""
+        # Log function call and error response to conversation history
+        self._log_function_call_and_response(function_name, args, error_response)
+
+        logger.error("RESULT %s: %s", function_name, error_result)
+        return error_response
+
     def add_items(self, bin_id: str, items: List[Dict[str, str]]) -> Dict[str, Any]:
         """Add items to a bin.
 
@@ -61,7 +76,7 @@ class InventoryFunctionWrappers:
             >>> add_items("3", [{"name": "screwdriver", "description": "Phillips head screwdriver"}])
             {"success": True, "message": "Successfully added 1 items to bin 3"}
         """
-        logger.info(f"CALL add_items(bin_id='{bin_id}', items={items})")
+        logger.info("CALL add_items(bin_id='%s', items=%s)", bin_id, items)
         try:
             # Convert dict items to ItemInput objects
             item_inputs = []
@@ -83,18 +98,14 @@ class InventoryFunctionWrappers:
             response_dict = response.model_dump()
             self._log_function_call_and_response("add_items", {"bin_id": bin_id, "items": items}, response_dict)
 
-            logger.info(f"RESULT add_items: {response.message}")
+            logger.info("RESULT add_items: %s", response.message)
             return response_dict
 
         except Exception as e:
             error_result = f"Error adding items: {str(e)}"
             error_response = {"success": False, "message": error_result}
 
-            # Log function call and error response to conversation history
-            self._log_function_call_and_response("add_items", {"bin_id": bin_id, "items": items}, error_response)
-
-            logger.error(f"RESULT add_items: {error_result}")
-            return error_response
+            return self._error_response("add_items", {"bin_id": bin_id, "items": items}, error_result, error_response)
     
     def search_items(self, query: str, limit: int = 10) -> Dict[str, Any]:
         """Search for items in inventory using semantic search.
@@ -120,7 +131,7 @@ class InventoryFunctionWrappers:
             >>> search_items("screwdriver", 5)
             {"success": True, "items": [{"id": "123", "name": "Phillips screwdriver", "bin_id": "A3", ...}], "current_bin": ""}
         """
-        logger.info(f"CALL search_items(query='{query}', limit={limit})")
+        logger.info("CALL search_items(query='%s', limit=%s)", query, limit)
         try:
             # Use business logic function
             response = search_items_logic(query, limit)
@@ -129,18 +140,14 @@ class InventoryFunctionWrappers:
             response_dict = response.model_dump()
             self._log_function_call_and_response("search_items", {"query": query, "limit": limit}, response_dict)
 
-            logger.info(f"RESULT search_items: Found {len(response.items)} items")
+            logger.info("RESULT search_items: Found %d items", len(response.items))
             return response_dict
 
         except Exception as e:
             error_result = f"Error searching items: {str(e)}"
             error_response = {"success": False, "items": [], "current_bin": ""}
 
-            # Log function call and error response to conversation history
-            self._log_function_call_and_response("search_items", {"query": query, "limit": limit}, error_response)
-
-            logger.error(f"RESULT search_items: {error_result}")
-            return error_response
+            return self._error_response("search_items", {"query": query, "limit": limit}, error_result, error_response)
     
     def get_bin_contents(self, bin_id: str) -> Dict[str, Any]:
         """Get all items in a specific storage bin.  This is the only way to know the contents of a bin bin.
@@ -165,7 +172,7 @@ class InventoryFunctionWrappers:
             >>> get_bin_contents("3")
             {"success": True, "bin_id": "3", "items": [{"id": "123", "name": "screwdriver", ...}], "total_count": 1}
         """
-        logger.info(f"CALL get_bin_contents(bin_id='{bin_id}')")
+        logger.info("CALL get_bin_contents(bin_id='%s')", bin_id)
         try:
             # Use business logic function
             response = get_bin_contents_logic(bin_id)
@@ -177,19 +184,16 @@ class InventoryFunctionWrappers:
             response_dict = response.model_dump()
             self._log_function_call_and_response("get_bin_contents", {"bin_id": bin_id}, response_dict)
 
-            item_names = [item.name for item in response.items]
-            logger.info(f"RESULT get_bin_contents: Found {len(response.items)} items in bin {bin_id}: {item_names}")
+            if logger.isEnabledFor(logging.INFO):
+                item_names = [item.name for item in response.items]
+                logger.info("RESULT get_bin_contents: Found %d items in bin %s: %s", len(response.items), bin_id, item_names)
             return response_dict
 
         except Exception as e:
             error_result = f"Error getting bin contents: {str(e)}"
             error_response = {"success": False, "bin_id": bin_id, "items": [], "total_count": 0}
 
-            # Log function call and error response to conversation history
-            self._log_function_call_and_response("get_bin_contents", {"bin_id": bin_id}, error_response)
-
-            logger.error(f"RESULT get_bin_contents: {error_result}")
-            return error_response
+            return self._error_response("get_bin_contents", {"bin_id": bin_id}, error_result, error_response)
     
     def move_items(self, target_bin_id: str, item_ids: List[str]) -> Dict[str, Any]:
         """Move items from their current bins to a target bin.
@@ -207,7 +211,7 @@ class InventoryFunctionWrappers:
             >>> move_items("5", ["item-123", "item-456"])
             {"success": True, "message": "Successfully moved 2 items to bin 5"}
         """
-        logger.info(f"CALL move_items(target_bin_id='{target_bin_id}', item_ids={item_ids})")
+        logger.info("CALL move_items(target_bin_id='%s', item_ids=%s)", target_bin_id, item_ids)
         try:
             # Use business logic function
             response = move_items_logic(item_ids, target_bin_id)
@@ -219,18 +223,14 @@ class InventoryFunctionWrappers:
             response_dict = response.model_dump()
             self._log_function_call_and_response("move_items", {"target_bin_id": target_bin_id, "item_ids": item_ids}, response_dict)
 
-            logger.info(f"RESULT move_items: {response.message}")
+            logger.info("RESULT move_items: %s", response.message)
             return response_dict
 
         except Exception as e:
             error_result = f"Error moving items: {str(e)}"
             error_response = {"success": False, "message": error_result}
 
-            # Log function call and error response to conversation history
-            self._log_function_call_and_response("move_items", {"target_bin_id": target_bin_id, "item_ids": item_ids}, error_response)
-
-            logger.error(f"RESULT move_items: {error_result}")
-            return error_response
+            return self._error_response("move_items", {"target_bin_id": target_bin_id, "item_ids": item_ids}, error_result, error_response)
     
     def remove_items(self, item_ids: List[str]) -> Dict[str, Any]:
         """Remove items completely from the inventory system.
@@ -247,7 +247,7 @@ class InventoryFunctionWrappers:
             >>> remove_items(["item-123", "item-456"])
             {"success": True, "message": "Successfully removed 2 items"}
         """
-        logger.info(f"CALL remove_items(item_ids={item_ids})")
+        logger.info("CALL remove_items(item_ids=%s)", item_ids)
         try:
             # Use business logic function
             response = remove_items_logic(item_ids)
@@ -256,18 +256,14 @@ class InventoryFunctionWrappers:
             response_dict = response.model_dump()
             self._log_function_call_and_response("remove_items", {"item_ids": item_ids}, response_dict)
 
-            logger.info(f"RESULT remove_items: {response.message}")
+            logger.info("RESULT remove_items: %s", response.message)
             return response_dict
 
         except Exception as e:
             error_result = f"Error removing items: {str(e)}"
             error_response = {"success": False, "message": error_result}
 
-            # Log function call and error response to conversation history
-            self._log_function_call_and_response("remove_items", {"item_ids": item_ids}, error_response)
-
-            logger.error(f"RESULT remove_items: {error_result}")
-            return error_response
+            return self._error_response("remove_items", {"item_ids": item_ids}, error_result, error_response)
 
 
 def get_function_wrappers(session_id: str) -> InventoryFunctionWrappers:
@@ -277,10 +273,4 @@ def get_function_wrappers(session_id: str) -> InventoryFunctionWrappers:
 
 def create_function_mapping(wrappers: InventoryFunctionWrappers) -> Dict[str, callable]:
     """Create mapping from function names to wrapper methods"""
-    return {
-        "add_items": wrappers.add_items,
-        "search_items": wrappers.search_items,
-        "get_bin_contents": wrappers.get_bin_contents,
-        "move_items": wrappers.move_items,
-        "remove_items": wrappers.remove_items
-    }
+    return {name: getattr(wrappers, name) for name in INVENTORY_FUNCTION_NAMES}
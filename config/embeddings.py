@@ -13,3 +13,6 @@ EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '100'))
 # text-embedding-3-small: 1536 dimensions
 # text-embedding-3-large: 3072 dimensions
 EMBEDDING_DIMENSION = int(os.getenv('EMBEDDING_DIMENSION', '768'))
+
+# Number of text embeddings kept in memory so repeated item names and queries skip the API
+EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', '4096'))
@@ -16,6 +16,10 @@ IMAGES_PATH = os.getenv('IMAGES_PATH', './data/images')
 API_HOST = os.getenv('API_HOST', '0.0.0.0')
 API_PORT = int(os.getenv('API_PORT', '8000'))
 SESSION_TTL_MINUTES = int(os.getenv('SESSION_TTL_MINUTES', '30'))
+MAX_CONVERSATION_MESSAGES = int(os.getenv('MAX_CONVERSATION_MESSAGES', '50'))
+# Only the most recent messages are sent to the LLM each turn; the window always
+# holds at least the message being answered (a slice of [-0:] would send everything)
+LLM_HISTORY_WINDOW = max(1, int(os.getenv('LLM_HISTORY_WINDOW', '20')))
 
 # Storage mode: 'memory' for testing, 'persistent' for production
 STORAGE_MODE = os.getenv('STORAGE_MODE', 'persistent')
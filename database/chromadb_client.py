@@ -4,6 +4,7 @@ ChromaDB Client for BinBot
 Simple vector storage and search for inventory items.
 """
 
+import threading
 from typing import List, Dict, Any
 from pathlib import Path
 
@@ -11,6 +12,9 @@ import chromadb
 from config.settings import DATABASE_PATH, STORAGE_MODE
 from config.embeddings import EMBEDDING_DIMENSION
 
+# Upper bound on results per search, whatever limit the caller asks for
+MAX_SEARCH_RESULTS = 50
+
 
 class ChromaDBClient:
     """Simple ChromaDB client for inventory management"""
@@ -86,22 +90,21 @@ class ChromaDBClient:
         embedding_service = get_embedding_service()
         query_embedding = embedding_service.generate_embedding(query)
 
-        # Get more results than needed to allow for distance filtering
-        search_limit = min(limit * 3, 50)  # Search more, filter down
+        # Results come back nearest first and the distance filter only ever drops a
+        # tail, so asking for more than `limit` can never add a result
         results = self._collection.query(
             query_embeddings=[query_embedding],
-            n_results=search_limit
+            n_results=min(limit, MAX_SEARCH_RESULTS),
+            include=['metadatas', 'distances']
         )
 
         items = []
         if results['ids'] and results['ids'][0]:
-            for i, item_id in enumerate(results['ids'][0]):
-                metadata = results['metadatas'][0][i]
-                distance = results['distances'][0][i]
-
-                # Filter by distance threshold
+            for item_id, metadata, distance in zip(results['ids'][0], results['metadatas'][0], results['distances'][0]):
+                # Filter by distance threshold; results come back nearest first,
+                # so everything after the first miss is further away still
                 if distance > max_distance:
-                    continue
+                    break
 
                 item = {
                     'id': item_id,
@@ -115,49 +118,56 @@ class ChromaDBClient:
                 }
                 items.append(item)
 
-                # Stop when we have enough results
-                if len(items) >= limit:
-                    break
-
         return items
     
     def remove_document(self, item_id: str):
         """Remove an item by ID"""
-        self._collection.delete(ids=[item_id])
+        self.remove_documents_bulk([item_id])
+
+    def remove_documents_bulk(self, item_ids: List[str]):
+        """Remove multiple items by ID in a single delete"""
+        if not item_ids:
+            return
+        self._collection.delete(ids=item_ids)
     
     def update_item_bin(self, item_id: str, new_bin_id: str):
         """Update an item's bin location (case-insensitive)"""
-        existing = self._collection.get(ids=[item_id])
+        self.update_items_bin_bulk([item_id], new_bin_id)
+
+    def update_items_bin_bulk(self, item_ids: List[str], new_bin_id: str):
+        """Move multiple items to a bin with one get and one update (case-insensitive)"""
+        if not item_ids:
+            return
+
+        existing = self._collection.get(ids=item_ids, include=['metadatas'])
         if existing['ids']:
-            metadata = existing['metadatas'][0]
-            metadata['bin_id'] = new_bin_id.lower()  # Normalize to lowercase
-            self._collection.update(ids=[item_id], metadatas=[metadata])
+            metadatas = existing['metadatas']
+            for metadata in metadatas:
+                metadata['bin_id'] = new_bin_id.lower()  # Normalize to lowercase
+            self._collection.update(ids=existing['ids'], metadatas=metadatas)
     
     def get_bin_contents(self, bin_id: str):
         """Get all items in a specific bin (case-insensitive)"""
         # Normalize bin_id to lowercase for case-insensitive matching
         normalized_bin_id = bin_id.lower()
-        results = self._collection.get(where={"bin_id": normalized_bin_id})
-
-        items = []
-        if results['ids']:
-            for i, item_id in enumerate(results['ids']):
-                metadata = results['metadatas'][i]
-                item = {
-                    'id': item_id,
-                    'name': metadata['name'],
-                    'description': metadata.get('description', ''),
-                    'bin_id': metadata['bin_id'],  # Return the normalized bin_id
-                    'created_at': metadata['created_at'],
-                    'image_id': metadata.get('image_id', '')
-                }
-                items.append(item)
-
-        return items
+        # Filter in Chroma and fetch only metadata; the document text is never used here
+        results = self._collection.get(where={"bin_id": normalized_bin_id}, include=['metadatas'])
+
+        return [
+            {
+                'id': item_id,
+                'name': metadata['name'],
+                'description': metadata.get('description', ''),
+                'bin_id': metadata['bin_id'],  # Return the normalized bin_id
+                'created_at': metadata['created_at'],
+                'image_id': metadata.get('image_id', '')
+            }
+            for item_id, metadata in zip(results['ids'], results['metadatas'])
+        ]
 
     def add_image_to_item(self, item_id: str, image_id: str):
         """Associate an image with an item"""
-        existing = self._collection.get(ids=[item_id])
+        existing = self._collection.get(ids=[item_id], include=['metadatas'])
         if existing['ids']:
             metadata = existing['metadatas'][0]
             metadata['image_id'] = image_id
@@ -171,11 +181,15 @@ class ChromaDBClient:
 
 # Global client instance
 _chromadb_client = None
+_chromadb_client_lock = threading.Lock()
 
 
 def get_chromadb_client() -> ChromaDBClient:
     """Get the global ChromaDB client"""
     global _chromadb_client
     if _chromadb_client is None:
-        _chromadb_client = ChromaDBClient()
+        # Chat tools reach this from worker threads; open the database and collection only once
+        with _chromadb_client_lock:
+            if _chromadb_client is None:
+                _chromadb_client = ChromaDBClient()
     return _chromadb_client
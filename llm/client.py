@@ -4,7 +4,8 @@ Simple Gemini LLM client for BinBot using new google-genai SDK
 
 from google import genai
 from google.genai import types
-from typing import List, Dict, Any
+from typing import List, Dict
+import threading
 
 from config.settings import GEMINI_API_KEY
 from llm.prompts import SYSTEM_INSTRUCTIONS, TTS_SYSTEM_INSTRUCTIONS
@@ -12,6 +13,43 @@ from llm.prompts import SYSTEM_INSTRUCTIONS, TTS_SYSTEM_INSTRUCTIONS
 # Model configuration
 GEMINI_MODEL = "gemini-2.5-flash-lite"
 
+# Sampling parameters shared by every Gemini call so repeated requests
+# with the same prefix stay deterministic and hit the implicit prompt cache
+GENERATION_TEMPERATURE = 0.0
+GENERATION_SEED = 42
+
+# Function calling setup shared by every request that passes tools
+_TOOL_CONFIG = types.ToolConfig(
+    function_calling_config=types.FunctionCallingConfig(mode='AUTO')
+)
+
+# Configs for requests without tools, built once per format type. The system
+# instructions are static, so every turn starts with the same prompt prefix.
+_TEXT_CONFIGS = {
+    format_type: types.GenerateContentConfig(
+        system_instruction=instructions,
+        temperature=GENERATION_TEMPERATURE,
+        seed=GENERATION_SEED
+    )
+    for format_type, instructions in (("MD", SYSTEM_INSTRUCTIONS), ("TTS", TTS_SYSTEM_INSTRUCTIONS))
+}
+
+
+# One google-genai client for the whole process; it owns the HTTP connection
+# pool, so sharing it keeps connections alive across requests and services
+_genai_client = None
+_genai_client_lock = threading.Lock()
+
+
+def get_genai_client() -> genai.Client:
+    """Get the shared google-genai client, creating it on first use"""
+    global _genai_client
+    if _genai_client is None:
+        with _genai_client_lock:
+            if _genai_client is None:
+                _genai_client = genai.Client(api_key=GEMINI_API_KEY)
+    return _genai_client
+
 
 class GeminiClient:
     """Simple Gemini LLM client using new google-genai SDK"""
@@ -19,50 +57,39 @@ class GeminiClient:
     def __init__(self):
         pass
 
-    def _create_client(self) -> genai.Client:
-        """Create a fresh Gemini client for each request"""
-        return genai.Client(api_key=GEMINI_API_KEY)
+    def _get_client(self) -> genai.Client:
+        """Get the shared Gemini client"""
+        return get_genai_client()
 
     def chat_completion(self, messages: List[Dict[str, str]], tools: List = None, format_type: str = "MD") -> str:
         """Send messages to Gemini and get response with automatic function calling using new SDK"""
-        # Create fresh client for this request
-        client = self._create_client()
+        client = self._get_client()
 
         # Choose system instructions based on format type
         system_instructions = TTS_SYSTEM_INSTRUCTIONS if format_type == "TTS" else SYSTEM_INSTRUCTIONS
 
-        # Separate the last message (current prompt) from history
         if not messages:
             return ""
 
-        current_message = messages[-1]['content']
-        history = messages[:-1] if len(messages) > 1 else []
-
-        # Convert history to Gemini format
-        history_contents = []
-        for msg in history:
-            history_contents.append(types.Content(
-                role=msg['role'],
+        # Convert history plus the current prompt (always sent as the user turn)
+        # to Gemini format in one pass
+        last = len(messages) - 1
+        all_contents = [
+            types.Content(
+                role="user" if i == last else msg['role'],
                 parts=[types.Part(text=msg['content'])]
-            ))
-
-        # For now, let's go back to the working generate_content approach
-        # Add current message to history for complete context
-        all_contents = history_contents + [types.Content(
-            role="user",
-            parts=[types.Part(text=current_message)]
-        )]
+            )
+            for i, msg in enumerate(messages)
+        ]
 
         if tools:
             # Configure automatic function calling with Python functions
             config = types.GenerateContentConfig(
                 tools=tools,  # Python functions passed directly
-                tool_config=types.ToolConfig(
-                    function_calling_config=types.FunctionCallingConfig(
-                        mode='AUTO'
-                    )                ),
+                tool_config=_TOOL_CONFIG,
                 system_instruction=system_instructions,
-                temperature=0.0
+                temperature=GENERATION_TEMPERATURE,
+                seed=GENERATION_SEED
             )
 
             # Send request with full context
@@ -73,9 +100,7 @@ class GeminiClient:
             )
         else:
             # Simple text generation with system instructions
-            config = types.GenerateContentConfig(
-                system_instruction=system_instructions
-            )
+            config = _TEXT_CONFIGS["TTS" if format_type == "TTS" else "MD"]
 
             response = client.models.generate_content(
                 model=GEMINI_MODEL,
@@ -83,14 +108,19 @@ class GeminiClient:
                 config=config
             )
 
-        return response.text if response.text else ""
+        # .text walks every candidate part and joins them, so read it once
+        return response.text or ""
     
     def generate_text(self, prompt: str) -> str:
         """Simple text generation using new SDK"""
-        client = self._create_client()
+        client = self._get_client()
         response = client.models.generate_content(
             model=GEMINI_MODEL,
-            contents=prompt
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                temperature=GENERATION_TEMPERATURE,
+                seed=GENERATION_SEED
+            )
         )
         return response.text
 
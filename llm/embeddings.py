@@ -2,49 +2,90 @@
 Simple embeddings service using Gemini with new google-genai SDK
 """
 
+import threading
+from collections import OrderedDict
 from google import genai
-from google.genai import types
-from typing import List
+from typing import List, Optional
 
-from config.settings import GEMINI_API_KEY
-from config.embeddings import EMBEDDING_MODEL
+from config.embeddings import EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_SIZE
+from llm.client import get_genai_client
 
 
 class EmbeddingService:
     """Simple embedding service using Gemini with new SDK"""
 
-    def __init__(self):
-        pass
+    def __init__(self, cache_size: int = EMBEDDING_CACHE_SIZE):
+        # LRU cache of text -> embedding; item names and search queries repeat often
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
-    def _create_client(self) -> genai.Client:
-        """Create a fresh Gemini client for each request"""
-        return genai.Client(api_key=GEMINI_API_KEY)
+    def _get_client(self) -> genai.Client:
+        """Get the shared Gemini client"""
+        return get_genai_client()
+
+    def _cache_get(self, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for a text, or None on miss"""
+        with self._cache_lock:
+            embedding = self._cache.get(text)
+            if embedding is not None:
+                self._cache.move_to_end(text)
+            return embedding
+
+    def _cache_put(self, text: str, embedding: List[float]):
+        """Store an embedding, evicting the least recently used entries"""
+        with self._cache_lock:
+            self._cache[text] = embedding
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a single text using new SDK"""
-        client = self._create_client()
+        embedding = self._cache_get(text)
+        if embedding is not None:
+            return embedding
+
+        client = self._get_client()
         response = client.models.embed_content(
             model=f"models/{EMBEDDING_MODEL}",
             contents=text
         )
-        return response.embeddings[0].values
+        embedding = response.embeddings[0].values
+        self._cache_put(text, embedding)
+        return embedding
 
     def batch_generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts"""
-        embeddings = []
-        for text in texts:
-            embedding = self.generate_embedding(text)
-            embeddings.append(embedding)
-        return embeddings
+        """Generate embeddings for multiple texts, one request per EMBEDDING_BATCH_SIZE uncached texts"""
+        # Embed each distinct text once (e.g. "add bolt, bolt, washer") and fan results back out
+        by_text = {text: self._cache_get(text) for text in dict.fromkeys(texts)}
+        missing = [text for text, embedding in by_text.items() if embedding is None]
+
+        client = self._get_client() if missing else None
+        for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+            chunk = missing[start:start + EMBEDDING_BATCH_SIZE]
+            response = client.models.embed_content(
+                model=f"models/{EMBEDDING_MODEL}",
+                contents=chunk
+            )
+            for text, embedding in zip(chunk, response.embeddings):
+                by_text[text] = embedding.values
+                self._cache_put(text, embedding.values)
+
+        return [by_text[text] for text in texts]
 
 
 # Global embedding service instance
 _embedding_service = None
+_embedding_service_lock = threading.Lock()
 
 
 def get_embedding_service() -> EmbeddingService:
     """Get the global embedding service"""
     global _embedding_service
     if _embedding_service is None:
-        _embedding_service = EmbeddingService()
+        # Inventory updates embed text in worker threads; a duplicate service would start with an empty cache
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService()
     return _embedding_service
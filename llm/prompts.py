@@ -228,3 +228,29 @@ When you see system messages about uploaded images with identified items and ima
 - NEVER pass item names (like "screwdriver", "hammer") to `move_items` or `remove_items`.
 - **For any command involving a list of items (e.g., "all items," "the tools") or a request to see a bin's contents, ALWAYS FIRST call `get_bin_contents` or `search_items` to get the UUIDs, and THEN proceed with the next step.**
 """
+
+# Reminder appended to every chat command before it is sent to the LLM
+COMMAND_REMINDER = "\n\n The contents of any bin change at any time without your knowledge.  Remember to abide by system instructions.  Always use the tools provided whenever possible.  Never rely on your memory for bin contents.  ALWAYS use get_bin_contents to retrieve the contents of a bin."
+
+# Extra reminder for TTS responses
+TTS_FORMAT_REMINDER = "\nRespond in a conversational, natural way suitable for text-to-speech. Keep responses short and avoid markdown formatting."
+
+# Fixed answer to a bare "help" or "?" chat message
+HELP_RESPONSE = """## 🤖 BinBot Help
+
+- **Add items**: "Add a hammer and two screwdrivers to bin 3"
+- **Find items**: "Where is the tape measure?"
+- **List a bin**: "What's in bin 5?"
+- **Move items**: "Move the hammer to bin 7"
+- **Remove items**: "Remove the screwdrivers"
+- **Photos**: Upload a picture of items, then tell me which bin to put them in"""
+
+# Help answer for TTS responses
+TTS_HELP_RESPONSE = ("You can ask me to add, find, move or remove items, or ask what's in a bin. "
+                     "You can also upload a photo and tell me which bin the items go in.")
+
+# Prompt for identifying inventory items in an uploaded image
+# (output shape is enforced by the response schema, so no JSON example is needed)
+VISION_ITEM_PROMPT = """Analyze this image and identify individual items that could be stored in bins.
+Focus on distinct, separate objects that would be inventory items.
+For each item, provide a clear name and brief description including any distinguishing features."""
@@ -4,17 +4,129 @@ Simple vision analysis using Gemini with new google-genai SDK
 
 from google import genai
 from google.genai import types
-from PIL import Image
-from typing import List, Dict
-import json
+from PIL import Image, features
+import orjson
+from typing import List, Dict, Optional, Tuple
+import asyncio
+import io
 
-from config.settings import GEMINI_API_KEY
+from llm.client import GEMINI_MODEL, GENERATION_TEMPERATURE, GENERATION_SEED, get_genai_client
+from llm.prompts import VISION_ITEM_PROMPT
+from llm.vision_cache import PROMPT_VERSION, get_vision_cache, image_cache_key
+from utils.images import flatten_image, resize_to_fit
+from utils.logging import setup_logger
+
+# Set up logger for vision service
+logger = setup_logger(__name__)
+
+# JPEG encoding is several times slower without the SIMD libjpeg-turbo backend
+if not features.check_feature('libjpeg_turbo'):
+    logger.warning("Pillow is not built with libjpeg-turbo; image encoding for vision analysis will be slow")
+
+# The prompt never changes, so its content part is built once and reused
+_PROMPT_PART = types.Part(text=VISION_ITEM_PROMPT)
+
+# Largest side (in pixels) of images sent for analysis
+MAX_IMAGE_SIDE = 1024
+
+# Listing the objects in a bin photo does not need fine detail, and a low
+# media resolution cuts the input tokens spent on each image
+ITEM_MEDIA_RESOLUTION = types.MediaResolution.MEDIA_RESOLUTION_LOW
+
+# Format and quality used when an image has to be re-encoded before upload.
+# WebP is about a third smaller than JPEG at similar quality; set to 'JPEG'
+# where WebP is not wanted.
+VISION_IMAGE_FORMAT = 'WEBP'
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+# Uploads already in one of these formats are sent as-is when no resize is needed
+_PASSTHROUGH_FORMATS = {'JPEG': 'image/jpeg', 'PNG': 'image/png', 'WEBP': 'image/webp'}
+_PASSTHROUGH_MODES = ('RGB', 'L', 'RGBA', 'LA', 'P')
+
+
+def _encode_for_vision(image: Image.Image) -> Tuple[bytes, str]:
+    """Encode an image for the API (with RGBA->RGB conversion), returning (bytes, mime type)"""
+    image = flatten_image(image)
+
+    img_byte_arr = io.BytesIO()
+    if VISION_IMAGE_FORMAT == 'WEBP':
+        # method=0 is WebP's fastest encoder setting
+        image.save(img_byte_arr, format='WEBP', quality=WEBP_QUALITY, method=0)
+        return img_byte_arr.getvalue(), "image/webp"
+
+    # Single Huffman pass, baseline, 4:2:0 chroma: the fastest libjpeg-turbo path
+    image.save(img_byte_arr, format='JPEG', quality=JPEG_QUALITY,
+               optimize=False, progressive=False, subsampling=2)
+    return img_byte_arr.getvalue(), "image/jpeg"
+
+
+def _read_image(image_path: str) -> bytes:
+    """Read an image file's raw bytes"""
+    with open(image_path, 'rb') as f:
+        return f.read()
+
+
+def _passthrough_mime_type(image: Image.Image) -> Optional[str]:
+    """Mime type to send the original bytes with, or None if the image needs processing"""
+    # Small images in a format Gemini accepts are sent as uploaded,
+    # skipping a pointless decode and re-encode
+    mime_type = _PASSTHROUGH_FORMATS.get(image.format)
+    if mime_type and max(image.size) <= MAX_IMAGE_SIDE and image.mode in _PASSTHROUGH_MODES:
+        return mime_type
+    return None
+
+
+def _prepare_image(raw_bytes: bytes) -> Tuple[bytes, str]:
+    """Return (image bytes, mime type) ready to send to Gemini"""
+    # Image.open only parses the header; pixels are decoded on first use below
+    image = Image.open(io.BytesIO(raw_bytes))
+
+    mime_type = _passthrough_mime_type(image)
+    if mime_type:
+        return raw_bytes, mime_type
+
+    # Resize if too large (keep it simple - max 1024px)
+    image = resize_to_fit(image, MAX_IMAGE_SIDE)
+    return _encode_for_vision(image)
+
+
+async def _prepare_image_async(raw_bytes: bytes) -> Tuple[bytes, str]:
+    """Prepare an image without blocking the event loop on decode/resize/encode"""
+    # Reading the header is cheap, so pass-through images skip the worker thread
+    mime_type = _passthrough_mime_type(Image.open(io.BytesIO(raw_bytes)))
+    if mime_type:
+        return raw_bytes, mime_type
+
+    # Pillow releases the GIL while decoding, resizing and encoding, so a worker
+    # thread keeps the event loop free without forking a copy of the server
+    return await asyncio.to_thread(_prepare_image, raw_bytes)
+
+
+def _parse_json(response_text: str) -> Dict:
+    """Parse the structured JSON response, returning an empty dict if it is malformed"""
+    try:
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError:
+        return {}
+
+
+def _image_part(img_bytes: bytes, mime_type: str) -> types.Part:
+    """Wrap image bytes in a content part (bytes data instead of PIL Image)"""
+    return types.Part(inline_data=types.Blob(mime_type=mime_type, data=img_bytes))
 
 
 class VisionService:
     """Simple vision service using Gemini with new SDK"""
 
     def __init__(self):
+        # Gemini client is fetched lazily from the process-wide shared instance
+        self._client = None
+
+        # Generation configs keyed by (schema id, media resolution); building one
+        # validates the whole schema, so it is done once per combination
+        self._configs: Dict[Tuple[int, types.MediaResolution], types.GenerateContentConfig] = {}
+
         # Define JSON schema for inventory items
         self.item_schema = {
             "type": "object",
@@ -34,85 +146,107 @@ class VisionService:
             "required": ["items"]
         }
 
-    def _create_client(self) -> genai.Client:
-        """Create a fresh Gemini client for each request"""
-        return genai.Client(api_key=GEMINI_API_KEY)
+    def _get_client(self) -> genai.Client:
+        """Get the shared Gemini client, creating it on first use"""
+        if self._client is None:
+            self._client = get_genai_client()
+        return self._client
 
-    def analyze_image(self, image_path: str) -> List[Dict[str, str]]:
-        """Analyze image and return structured list of items using JSON schema"""
-        # Load and resize image for analysis
-        image = Image.open(image_path)
-
-        # Resize if too large (keep it simple - max 1024px)
-        if max(image.size) > 1024:
-            ratio = 1024 / max(image.size)
-            new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
-
-        # Convert PIL Image to bytes for the API (with RGBA->RGB conversion)
-        import io
-        img_byte_arr = io.BytesIO()
-
-        # Convert RGBA to RGB if necessary (PNG with transparency -> JPEG)
-        if image.mode in ('RGBA', 'LA', 'P'):
-            # Create a white background for transparent images
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode == 'P':
-                image = image.convert('RGBA')
-            background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-            image = background
-        elif image.mode not in ('RGB', 'L'):
-            # Convert any other modes to RGB
-            image = image.convert('RGB')
-
-        image.save(img_byte_arr, format='JPEG', quality=95)
-        img_bytes = img_byte_arr.getvalue()
-
-        # Create prompt for structured output
-        prompt = """
-        Analyze this image and identify individual items that could be stored in bins.
-
-        Focus on distinct, separate objects that would be inventory items.
-        For each item, provide a clear name and brief description including any distinguishing features.
-        """
-
-        # Create content with image and text for new SDK
-        contents = [
-            types.Content(
-                role="user",
-                parts=[
-                    types.Part(text=prompt),
-                    types.Part(inline_data=types.Blob(
-                        mime_type="image/jpeg",
-                        data=img_bytes  # Pass bytes data instead of PIL Image
-                    ))
-                ]
-            )
-        ]
+    def _cache_key(self, raw_bytes: bytes, media_resolution: types.MediaResolution) -> str:
+        """Cache key for an uploaded image analyzed at a given media resolution"""
+        return image_cache_key(raw_bytes, f"{PROMPT_VERSION}:{media_resolution.value}")
 
-        # Configure for JSON output
-        config = types.GenerateContentConfig(
-            response_mime_type="application/json",
-            response_schema=self.item_schema
-        )
+    def _json_config(self, schema: Dict, media_resolution: types.MediaResolution) -> types.GenerateContentConfig:
+        """Configure for JSON output"""
+        # Schemas are attributes of this service, so their ids are stable
+        key = (id(schema), media_resolution)
+        config = self._configs.get(key)
+        if config is None:
+            config = types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=schema,
+                temperature=GENERATION_TEMPERATURE,
+                seed=GENERATION_SEED,
+                media_resolution=media_resolution
+            )
+            self._configs[key] = config
+        return config
 
-        # Create fresh client for this request
-        client = self._create_client()
+    def _generate_json(self, parts: List[types.Part], schema: Dict,
+                       media_resolution: types.MediaResolution) -> Dict:
+        """Send prompt and image parts to Gemini and parse the structured JSON response"""
+        client = self._get_client()
 
         # Generate structured response using new SDK
         response = client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=contents,
-            config=config
+            model=GEMINI_MODEL,
+            contents=[types.Content(role="user", parts=parts)],
+            config=self._json_config(schema, media_resolution)
+        )
+        return _parse_json(response.text)
+
+    async def _generate_json_async(self, parts: List[types.Part], schema: Dict,
+                                   media_resolution: types.MediaResolution) -> Dict:
+        """Async version of _generate_json that does not block the event loop"""
+        client = self._get_client()
+
+        response = await client.aio.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=[types.Content(role="user", parts=parts)],
+            config=self._json_config(schema, media_resolution)
         )
+        return _parse_json(response.text)
 
-        # Parse the structured JSON response
-        try:
-            result = json.loads(response.text)
-            return result.get("items", [])
-        except json.JSONDecodeError:
+    def analyze_image(self, image_path: str,
+                      media_resolution: types.MediaResolution = ITEM_MEDIA_RESOLUTION) -> List[Dict[str, str]]:
+        """Analyze image and return structured list of items using JSON schema"""
+        raw_bytes = _read_image(image_path)
+
+        # Skip decoding and the model call entirely if this exact file was analyzed before
+        cache = get_vision_cache()
+        cache_key = self._cache_key(raw_bytes, media_resolution)
+        cached_items = cache.check_cache(cache_key)
+        if cached_items is not None:
+            return cached_items
+
+        img_bytes, mime_type = _prepare_image(raw_bytes)
+        parts = [_PROMPT_PART, _image_part(img_bytes, mime_type)]
+
+        result = self._generate_json(parts, self.item_schema, media_resolution)
+        if "items" not in result:
             return []
 
+        items = result["items"]
+        cache.save_to_cache(cache_key, items)
+        return items
+
+    async def analyze_image_async(self, image_path: str,
+                                  media_resolution: types.MediaResolution = ITEM_MEDIA_RESOLUTION) -> List[Dict[str, str]]:
+        """Async version of analyze_image for use from request handlers"""
+        loop = asyncio.get_running_loop()
+        raw_bytes = await loop.run_in_executor(None, _read_image, image_path)
+        return await self.analyze_image_bytes_async(raw_bytes, media_resolution)
+
+    async def analyze_image_bytes_async(self, raw_bytes: bytes,
+                                        media_resolution: types.MediaResolution = ITEM_MEDIA_RESOLUTION) -> List[Dict[str, str]]:
+        """Analyze image bytes already in memory (e.g. an upload) without a round trip through disk"""
+        cache = get_vision_cache()
+        cache_key = self._cache_key(raw_bytes, media_resolution)
+        cached_items = cache.check_cache(cache_key)
+        if cached_items is not None:
+            return cached_items
+
+        img_bytes, mime_type = await _prepare_image_async(raw_bytes)
+        parts = [_PROMPT_PART, _image_part(img_bytes, mime_type)]
+
+        result = await self._generate_json_async(parts, self.item_schema, media_resolution)
+        if "items" not in result:
+            return []
+
+        items = result["items"]
+        cache.save_to_cache(cache_key, items)
+        return items
+
 
 # Global vision service instance
 _vision_service = None
@@ -0,0 +1,77 @@
+"""
+Simple in-memory cache for vision analysis results
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Bump when the vision prompt, item schema or preprocessing changes so stale results are ignored
+PROMPT_VERSION = "v1"
+
+# Cache limits
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def image_cache_key(image_bytes: bytes, version: str = PROMPT_VERSION) -> str:
+    """Build a cache key from the uploaded image bytes and the prompt version"""
+    digest = hashlib.sha256(image_bytes)
+    digest.update(version.encode())
+    return digest.hexdigest()
+
+
+class VisionCache:
+    """LRU cache of analyzed items keyed by image hash, with TTL"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: int = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check_cache(self, key: str) -> Optional[List[Dict[str, str]]]:
+        """Return cached items for a key, or None on miss or expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, items = entry
+            if time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return list(items)
+
+    def save_to_cache(self, key: str, items: List[Dict[str, str]]):
+        """Store analyzed items for a key, evicting the least recently used entry"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, list(items))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global vision cache instance
+_vision_cache = None
+_vision_cache_lock = threading.Lock()
+
+
+def get_vision_cache() -> VisionCache:
+    """Get the global vision cache"""
+    global _vision_cache
+    if _vision_cache is None:
+        # Synchronous analyze_image callers may be worker threads; a second cache would miss the first one's entries
+        with _vision_cache_lock:
+            if _vision_cache is None:
+                _vision_cache = VisionCache()
+    return _vision_cache
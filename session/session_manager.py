@@ -2,62 +2,92 @@
 Simple in-memory session management for BinBot
 """
 
-import uuid
+import asyncio
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from config.settings import SESSION_TTL_MINUTES
+from config.settings import SESSION_TTL_MINUTES, MAX_CONVERSATION_MESSAGES
 from utils.logging import setup_logger
 
 # Set up logger for session management
 logger = setup_logger(__name__)
 
+# A message resubmitted within this many seconds (double-click, client retry)
+# gets the previous answer instead of a second LLM call
+DUPLICATE_REQUEST_WINDOW_SECONDS = 5
+
 
 class SessionManager:
     """Simple in-memory session store with TTL"""
     
     def __init__(self):
-        self._sessions: Dict[str, Dict] = {}
+        # Kept in last-accessed order (oldest first) so expired sessions can be
+        # dropped from the front without scanning every session
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        # Guards reordering and removal; get_session also runs in worker threads
+        # (chat tools), and cleanup walks the dict while other requests touch it
+        self._sessions_lock = threading.Lock()
     
     def new_session(self) -> str:
         """Create a new session and return session ID"""
-        session_id = str(uuid.uuid4())
+        # Drop sessions nobody came back to; cheap because only expired ones at the front are touched
+        self.cleanup_expired_sessions()
+
+        # 128 random bits straight from the OS, URL-safe for the cookie
+        session_id = secrets.token_urlsafe(16)
         now = datetime.now()
 
-        self._sessions[session_id] = {
+        session = {
             'session_id': session_id,
             'created_at': now,
             'last_accessed': now,
             'current_bin': '',
-            'conversation': []
+            'conversation': [],
+            'last_response': None,
+            # Number of chat turns answered; a resubmit compares it with the value it saw on arrival
+            'answered_turns': 0,
+            # Upload and analysis messages of the latest image, kept in the LLM window
+            # (they hold the image_id needed to add its items) even after older turns drop out
+            'image_context': None,
+            # Function-calling tools bound to this session, created on first chat
+            'tools': None,
+            # Serializes chat turns within this session
+            'lock': asyncio.Lock()
         }
+        with self._sessions_lock:
+            self._sessions[session_id] = session
 
-        logger.info(f"NEW_SESSION created: {session_id[:8]}... (current_bin: '')")
+        logger.info("NEW_SESSION created: %s... (current_bin: '')", session_id[:8])
         return session_id
     
     def get_session(self, session_id: str) -> Optional[Dict]:
         """Get session data if it exists and hasn't expired"""
-        if session_id not in self._sessions:
-            logger.warning(f"GET_SESSION: Session {session_id[:8]}... not found")
-            return None
-
-        session = self._sessions[session_id]
+        with self._sessions_lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                logger.warning("GET_SESSION: Session %s... not found", session_id[:8])
+                return None
 
-        # Check if expired
-        if self._is_expired(session):
-            logger.info(f"GET_SESSION: Session {session_id[:8]}... expired, removing")
-            del self._sessions[session_id]
-            return None
+            # Check if expired
+            if self._is_expired(session):
+                logger.info("GET_SESSION: Session %s... expired, removing", session_id[:8])
+                del self._sessions[session_id]
+                return None
 
-        # Update last accessed
-        session['last_accessed'] = datetime.now()
-        logger.debug(f"GET_SESSION: {session_id[:8]}... (current_bin: '{session['current_bin']}')")
+            # Update last accessed
+            session['last_accessed'] = datetime.now()
+            self._sessions.move_to_end(session_id)
+        logger.debug("GET_SESSION: %.8s... (current_bin: '%s')", session_id, session['current_bin'])
         return session
     
     def end_session(self, session_id: str):
         """Remove a session"""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        with self._sessions_lock:
+            self._sessions.pop(session_id, None)
     
     def set_current_bin(self, session_id: str, bin_id: str):
         """Set the current bin for a session"""
@@ -65,37 +95,83 @@ class SessionManager:
         if session:
             old_bin = session['current_bin']
             session['current_bin'] = bin_id
-            logger.info(f"SET_CURRENT_BIN: {session_id[:8]}... '{old_bin}' → '{bin_id}'")
+            logger.info("SET_CURRENT_BIN: %s... '%s' → '%s'", session_id[:8], old_bin, bin_id)
         else:
-            logger.error(f"SET_CURRENT_BIN: Failed - session {session_id[:8]}... not found or expired")
+            logger.error("SET_CURRENT_BIN: Failed - session %s... not found or expired", session_id[:8])
         
     
     def add_message(self, session_id: str, role: str, content: str):
         """Add a message to the conversation"""
         session = self.get_session(session_id)
         if session:
-            session['conversation'].append({
-                'role': role,
-                'content': content,
-                'timestamp': datetime.now().isoformat()
-            })
+            self.append_message(session, role, content)
+
+    def append_message(self, session: Dict, role: str, content: str):
+        """Add a message to an already looked-up session's conversation"""
+        conversation = session['conversation']
+        conversation.append({
+            'role': role,
+            'content': content,
+            'timestamp': datetime.now().isoformat()
+        })
+
+        # Keep only the most recent messages so long sessions don't grow without bound
+        if len(conversation) > MAX_CONVERSATION_MESSAGES:
+            del conversation[0]
     
     def get_conversation(self, session_id: str) -> List[Dict]:
         """Get conversation history"""
         session = self.get_session(session_id)
         return session['conversation'] if session else []
     
+    def remember_response(self, session_id: str, message: str, response_format: str,
+                          response: str, current_bin: Optional[str]):
+        """Remember the answer to a chat message so an immediate resubmit can reuse it"""
+        session = self._sessions.get(session_id)
+        if session:
+            conversation = session['conversation']
+            session['answered_turns'] += 1
+            session['last_response'] = {
+                'message': message,
+                'format': response_format,
+                'response': response,
+                'current_bin': current_bin,
+                'answered_at': time.monotonic(),
+                # Last message of the answered turn; anything appended after it means the chat moved on
+                'last_message': conversation[-1] if conversation else None
+            }
+
+    def get_recent_response(self, session_id: str, message: str, response_format: str,
+                            answered_turns_seen: int) -> Optional[Tuple[str, Optional[str]]]:
+        """Return (response, current_bin) if this request resubmits the message just answered, else None"""
+        # answered_turns_seen is the session's answered_turns when the request arrived. Only an
+        # answer completed after that can belong to the same submission; the same text sent
+        # after the answer was shown (e.g. "yes" to a new question) is a new turn
+        session = self._sessions.get(session_id)
+        last_response = session.get('last_response') if session else None
+        if not last_response or session['answered_turns'] <= answered_turns_seen:
+            return None
+
+        conversation = session['conversation']
+        if (last_response['message'] != message or last_response['format'] != response_format
+                or time.monotonic() - last_response['answered_at'] > DUPLICATE_REQUEST_WINDOW_SECONDS
+                or not conversation or conversation[-1] is not last_response['last_message']):
+            return None
+        return last_response['response'], last_response['current_bin']
+
     def cleanup_expired_sessions(self):
         """Remove expired sessions"""
-        expired_ids = []
-        for session_id, session in self._sessions.items():
-            if self._is_expired(session):
-                expired_ids.append(session_id)
-        
-        for session_id in expired_ids:
-            del self._sessions[session_id]
+        # Sessions are ordered by last access, so stop at the first one still alive
+        removed = 0
+        with self._sessions_lock:
+            while self._sessions:
+                session_id, session = next(iter(self._sessions.items()))
+                if not self._is_expired(session):
+                    break
+                del self._sessions[session_id]
+                removed += 1
         
-        return len(expired_ids)
+        return removed
     
     def _is_expired(self, session: Dict) -> bool:
         """Check if a session has expired"""
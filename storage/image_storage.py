@@ -2,15 +2,15 @@
 Simple local image storage for BinBot
 """
 
-import os
+import io
 import uuid
-import shutil
-import json
+import threading
 from pathlib import Path
 from typing import Dict, Optional
 from PIL import Image
 
 from config.settings import IMAGES_PATH, STORAGE_MODE
+from utils.images import flatten_image, resize_to_fit
 
 
 class ImageStorage:
@@ -32,19 +32,14 @@ class ImageStorage:
         """Save an image file and return image_id (always converts to JPG)"""
         image_id = str(uuid.uuid4())
 
-        if STORAGE_MODE == 'memory':
-            # In-memory storage - convert to JPG
-            image = Image.open(file_path)
-            # Convert to RGB if necessary (for PNG with transparency, etc.)
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-
-            # Save as JPG to bytes
-            import io
-            img_bytes = io.BytesIO()
-            image.save(img_bytes, format='JPEG', quality=85, optimize=True)
-            image_bytes = img_bytes.getvalue()
+        # Convert to JPG (transparent areas of PNGs etc. go on white)
+        image = flatten_image(Image.open(file_path))
+        img_bytes = io.BytesIO()
+        image.save(img_bytes, format='JPEG', quality=85, optimize=True)
+        image_bytes = img_bytes.getvalue()
 
+        if STORAGE_MODE == 'memory':
+            # In-memory storage
             self._image_data[image_id] = image_bytes
 
             # Store minimal metadata for memory mode
@@ -54,14 +49,9 @@ class ImageStorage:
                 'file_size': len(image_bytes)
             }
         else:
-            # Persistent file storage - convert to JPG
-            image = Image.open(file_path)
-            # Convert to RGB if necessary (for PNG with transparency, etc.)
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-
+            # Persistent file storage
             dest_path = self.storage_path / f"{image_id}.jpg"
-            image.save(dest_path, format='JPEG', quality=85, optimize=True)
+            dest_path.write_bytes(image_bytes)
 
         return image_id
     
@@ -132,12 +122,8 @@ class ImageStorage:
         if max(image.size) <= max_size:
             return image_path
         
-        # Calculate new size
-        ratio = max_size / max(image.size)
-        new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-        
         # Resize image
-        resized_image = image.resize(new_size, Image.Resampling.LANCZOS)
+        resized_image = resize_to_fit(image, max_size)
         
         # Save resized version
         base_path = Path(image_path)
@@ -149,11 +135,15 @@ class ImageStorage:
 
 # Global image storage instance
 _image_storage = None
+_image_storage_lock = threading.Lock()
 
 
 def get_image_storage() -> ImageStorage:
     """Get the global image storage instance"""
     global _image_storage
     if _image_storage is None:
-        _image_storage = ImageStorage()
+        # Uploads are saved from worker threads; in memory mode a second instance would lose the first one's images
+        with _image_storage_lock:
+            if _image_storage is None:
+                _image_storage = ImageStorage()
     return _image_storage
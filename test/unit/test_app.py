@@ -91,6 +91,24 @@ def test_app_import():
         return False
 
 
+def test_app_shutdown_closes_tts_client():
+    """Test that app shutdown closes the shared TTS HTTP client"""
+    print("\n🧪 Testing App Shutdown")
+    print("=" * 22)
+
+    from fastapi.testclient import TestClient
+    import api.tts as tts
+
+    with TestClient(create_app()):
+        client = tts._get_http_client()
+        assert not client.is_closed
+
+    assert client.is_closed
+    assert tts._http_client is None
+    print("✅ TTS HTTP client closed at shutdown")
+    return True
+
+
 if __name__ == "__main__":
     print("🚀 BinBot FastAPI App Test")
     print("Tests application setup and configuration")
@@ -99,8 +117,9 @@ if __name__ == "__main__":
     success1 = test_app_creation()
     success2 = test_app_middleware()
     success3 = test_app_import()
+    success4 = test_app_shutdown_closes_tts_client()
     
-    success = success1 and success2 and success3
+    success = success1 and success2 and success3 and success4
     
     print("\n" + "=" * 50)
     if success:
@@ -2,10 +2,12 @@
 Tests for simplified BinBot configuration system
 """
 
+import importlib
 import os
 import sys
 sys.path.append('.')
 
+import config.settings
 from config.settings import GEMINI_API_KEY, DATABASE_PATH, API_PORT, SESSION_TTL_MINUTES
 from config.embeddings import EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE
 
@@ -35,12 +37,31 @@ def test_config_constants():
     return True
 
 
+def test_history_window_floor():
+    """Test that the LLM history window never drops below one message"""
+    print("🧪 Testing LLM history window floor...")
+
+    original = os.environ.get('LLM_HISTORY_WINDOW')
+    try:
+        for value in ('0', '-5'):
+            os.environ['LLM_HISTORY_WINDOW'] = value
+            assert importlib.reload(config.settings).LLM_HISTORY_WINDOW == 1
+            print(f"✅ LLM_HISTORY_WINDOW={value} sends only the current message")
+    finally:
+        if original is None:
+            os.environ.pop('LLM_HISTORY_WINDOW', None)
+        else:
+            os.environ['LLM_HISTORY_WINDOW'] = original
+        importlib.reload(config.settings)
+
+
 if __name__ == "__main__":
     print("🧪 Testing simplified configuration system...")
     print("=" * 50)
 
     try:
         success = test_config_constants()
+        test_history_window_floor()
         print("\n" + "=" * 50)
         if success:
             print("🎉 All configuration tests passed!")
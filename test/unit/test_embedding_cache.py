@@ -0,0 +1,68 @@
+"""
+Tests for the in-memory embedding cache
+"""
+
+import sys
+sys.path.append('.')
+
+from llm.embeddings import EmbeddingService
+
+
+def test_cache_hit_and_eviction():
+    """Test cache lookups and LRU eviction"""
+    print("🧪 Testing embedding cache hit and eviction...")
+
+    service = EmbeddingService(cache_size=2)
+    assert service._cache_get("hammer") is None
+    print("✅ Miss on empty cache")
+
+    service._cache_put("hammer", [0.1, 0.2])
+    service._cache_put("tape", [0.3, 0.4])
+    assert service._cache_get("hammer") == [0.1, 0.2]
+    print("✅ Hit after put")
+
+    # "hammer" was just used, so "tape" is the least recently used entry
+    service._cache_put("drill", [0.5, 0.6])
+    assert service._cache_get("tape") is None
+    assert service._cache_get("hammer") == [0.1, 0.2]
+    print("✅ Least recently used entry evicted")
+
+    return True
+
+
+def test_cached_texts_skip_the_api():
+    """Test that fully cached requests never reach the embedding API"""
+    print("🧪 Testing cached embeddings skip the API...")
+
+    def no_client():
+        raise AssertionError("embedding API should not be called")
+
+    service = EmbeddingService()
+    service._get_client = no_client
+    service._cache_put("hammer", [0.1])
+    service._cache_put("tape", [0.2])
+
+    assert service.generate_embedding("hammer") == [0.1]
+    assert service.batch_generate_embeddings(["tape", "hammer", "tape"]) == [[0.2], [0.1], [0.2]]
+    assert service.batch_generate_embeddings([]) == []
+    print("✅ Cached single and batch requests served locally")
+
+    return True
+
+
+if __name__ == "__main__":
+    print("🧪 Testing embedding cache...")
+    print("=" * 50)
+
+    try:
+        test_cache_hit_and_eviction()
+        print()
+        test_cached_texts_skip_the_api()
+
+        print("\n" + "=" * 50)
+        print("🎉 All embedding cache tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
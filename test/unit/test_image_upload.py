@@ -0,0 +1,119 @@
+"""
+Tests for storing and analyzing an uploaded image concurrently
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+from PIL import Image
+
+sys.path.append('.')
+os.environ.setdefault('GEMINI_API_KEY', 'test-key')
+
+import api.images as images_api
+from storage.image_storage import ImageStorage
+
+
+class FakeVision:
+    """Vision service stand-in that either returns items or fails"""
+
+    def __init__(self, error: Exception = None, delay: float = 0.0):
+        self.error = error
+        self.delay = delay
+        self.finished = False
+
+    async def analyze_image_bytes_async(self, raw_bytes: bytes):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.finished = True
+        return [{'name': 'pen', 'description': 'blue'}]
+
+
+class FailingStorage(ImageStorage):
+    """Image storage whose saves always fail"""
+
+    def save_image(self, file_path: str, original_filename: str = "") -> str:
+        raise OSError("disk full")
+
+
+def create_upload() -> tuple:
+    """Write a small image to a temporary file and return (path, bytes)"""
+    temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+    Image.new('RGB', (8, 8), color='red').save(temp_file, 'PNG')
+    temp_file.close()
+    with open(temp_file.name, 'rb') as f:
+        return temp_file.name, f.read()
+
+
+def run_upload(storage: ImageStorage, vision: FakeVision):
+    """Run store_and_analyze_upload against the given storage and vision service"""
+    original = (images_api.get_image_storage, images_api.get_vision_service)
+    images_api.get_image_storage = lambda: storage
+    images_api.get_vision_service = lambda: vision
+    temp_path, content = create_upload()
+    try:
+        return asyncio.run(images_api.store_and_analyze_upload(temp_path, "upload.png", content))
+    finally:
+        images_api.get_image_storage, images_api.get_vision_service = original
+        os.unlink(temp_path)
+
+
+def test_upload_success():
+    """Test that a successful upload is stored and analyzed"""
+    print("🧪 Testing successful upload...")
+
+    storage = ImageStorage()
+    image_id, items = run_upload(storage, FakeVision())
+    assert storage.get_image_metadata(image_id) is not None
+    assert items == [{'name': 'pen', 'description': 'blue'}]
+    print("✅ Image stored and analyzed")
+
+
+def test_analysis_failure_removes_image():
+    """Test that a failed analysis leaves no stored image behind"""
+    print("🧪 Testing analysis failure...")
+
+    storage = ImageStorage()
+    try:
+        run_upload(storage, FakeVision(error=RuntimeError("vision down")))
+        assert False, "analysis error was not raised"
+    except RuntimeError as e:
+        assert str(e) == "vision down"
+    assert len(storage._metadata) == 0
+    print("✅ Analysis error raised and stored image removed")
+
+
+def test_save_failure_cancels_analysis():
+    """Test that a failed save stops the analysis"""
+    print("🧪 Testing save failure...")
+
+    vision = FakeVision(delay=0.5)
+    try:
+        run_upload(FailingStorage(), vision)
+        assert False, "save error was not raised"
+    except OSError as e:
+        assert str(e) == "disk full"
+    assert not vision.finished
+    print("✅ Save error raised and analysis cancelled")
+
+
+if __name__ == "__main__":
+    print("🧪 Running Image Upload Tests")
+    print("=" * 50)
+
+    try:
+        test_upload_success()
+        print()
+        test_analysis_failure_removes_image()
+        print()
+        test_save_failure_cancels_analysis()
+
+        print("\n" + "=" * 50)
+        print("🎉 All image upload tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,70 @@
+"""
+Tests for shared image preprocessing helpers
+"""
+
+import io
+import sys
+sys.path.append('.')
+
+from PIL import Image
+
+from utils.images import flatten_image, resize_to_fit
+
+
+def test_resize_to_fit():
+    """Test downscaling keeps aspect ratio and leaves small images alone"""
+    print("🧪 Testing resize_to_fit...")
+
+    small = Image.new('RGB', (500, 300))
+    assert resize_to_fit(small, 1024) is small
+    print("✅ Small image not resized")
+
+    # A JPEG exactly twice the limit is drafted, then must still be resized to the limit
+    buffer = io.BytesIO()
+    Image.new('RGB', (4000, 3000)).save(buffer, format='JPEG')
+    large = Image.open(io.BytesIO(buffer.getvalue()))
+    assert resize_to_fit(large, 1024).size == (1024, 768)
+    print("✅ Large JPEG resized to (1024, 768)")
+
+    return True
+
+
+def test_flatten_image():
+    """Test conversion of transparent and palette images"""
+    print("🧪 Testing flatten_image...")
+
+    transparent = Image.new('RGBA', (10, 10), (0, 0, 0, 0))
+    flattened = flatten_image(transparent)
+    assert flattened.mode == 'RGB'
+    assert flattened.getpixel((0, 0)) == (255, 255, 255)
+    print("✅ Transparent areas put on white")
+
+    opaque = Image.new('RGBA', (10, 10), (10, 20, 30, 255))
+    flattened = flatten_image(opaque)
+    assert flattened.mode == 'RGB'
+    assert flattened.getpixel((0, 0)) == (10, 20, 30)
+    print("✅ Opaque alpha dropped")
+
+    assert flatten_image(Image.new('P', (10, 10))).mode == 'RGB'
+    assert flatten_image(Image.new('CMYK', (10, 10))).mode == 'RGB'
+    print("✅ Palette and CMYK converted to RGB")
+
+    return True
+
+
+if __name__ == "__main__":
+    print("🧪 Testing image utilities...")
+    print("=" * 50)
+
+    try:
+        test_resize_to_fit()
+        print()
+        test_flatten_image()
+
+        print("\n" + "=" * 50)
+        print("🎉 All image utility tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
@@ -6,7 +6,8 @@ import sys
 import time
 sys.path.append('.')
 
-from session.session_manager import SessionManager
+from config.settings import MAX_CONVERSATION_MESSAGES
+from session.session_manager import SessionManager, DUPLICATE_REQUEST_WINDOW_SECONDS
 
 
 def test_session_basic_operations():
@@ -112,6 +113,64 @@ def test_cleanup():
     return True
 
 
+def test_conversation_cap():
+    """Test that history is capped at MAX_CONVERSATION_MESSAGES"""
+    print("🧪 Testing conversation cap...")
+
+    manager = SessionManager()
+    session_id = manager.new_session()
+
+    for i in range(MAX_CONVERSATION_MESSAGES + 5):
+        manager.add_message(session_id, 'user', f"message {i}")
+
+    conversation = manager.get_conversation(session_id)
+    assert len(conversation) == MAX_CONVERSATION_MESSAGES
+    assert conversation[0]['content'] == "message 5"
+    assert conversation[-1]['content'] == f"message {MAX_CONVERSATION_MESSAGES + 4}"
+    print(f"✅ Oldest messages dropped, {MAX_CONVERSATION_MESSAGES} most recent kept")
+
+    return True
+
+
+def test_duplicate_response():
+    """Test that only a resubmit waiting on the same turn reuses its answer"""
+    print("🧪 Testing duplicate request detection...")
+
+    manager = SessionManager()
+    session_id = manager.new_session()
+    session = manager.get_session(session_id)
+
+    # Two submits of "yes" arrive together; the first is answered while the second waits
+    seen_on_arrival = session['answered_turns']
+    manager.add_message(session_id, 'user', 'yes')
+    manager.add_message(session_id, 'model', 'Added. Add the tape too?')
+    manager.remember_response(session_id, 'yes', 'MD', 'Added. Add the tape too?', '3')
+
+    assert manager.get_recent_response(session_id, 'yes', 'MD', seen_on_arrival) == ('Added. Add the tape too?', '3')
+    print("✅ Resubmit that arrived before the answer reuses it")
+
+    assert manager.get_recent_response(session_id, 'yes', 'TTS', seen_on_arrival) is None
+    assert manager.get_recent_response(session_id, 'no', 'MD', seen_on_arrival) is None
+    print("✅ Different message or format is not a duplicate")
+
+    # The same text sent after the answer came back answers the new question
+    assert manager.get_recent_response(session_id, 'yes', 'MD', session['answered_turns']) is None
+    print("✅ Same text sent after the answer is a new turn")
+
+    # Anything appended after the answer (e.g. an image upload) means the chat moved on
+    manager.add_message(session_id, 'user', '[Image uploaded: bin.jpg]')
+    assert manager.get_recent_response(session_id, 'yes', 'MD', seen_on_arrival) is None
+    print("✅ No reuse once another message was added")
+
+    # Outside the window the answer is stale
+    manager.remember_response(session_id, 'yes', 'MD', 'Done.', '3')
+    session['last_response']['answered_at'] -= DUPLICATE_REQUEST_WINDOW_SECONDS + 1
+    assert manager.get_recent_response(session_id, 'yes', 'MD', seen_on_arrival) is None
+    print("✅ No reuse after the duplicate window")
+
+    return True
+
+
 if __name__ == "__main__":
     print("🧪 Testing session management...")
     print("=" * 50)
@@ -122,6 +181,10 @@ if __name__ == "__main__":
         test_session_expiration()
         print()
         test_cleanup()
+        print()
+        test_conversation_cap()
+        print()
+        test_duplicate_response()
         
         print("\n" + "=" * 50)
         print("🎉 All session management tests passed!")
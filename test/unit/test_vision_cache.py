@@ -0,0 +1,73 @@
+"""
+Tests for the vision analysis result cache
+"""
+
+import sys
+sys.path.append('.')
+
+from llm.vision_cache import VisionCache, image_cache_key
+
+
+def test_cache_hit_and_miss():
+    """Test basic cache lookups"""
+    print("🧪 Testing vision cache hit and miss...")
+
+    cache = VisionCache()
+    key = image_cache_key(b"fake image bytes")
+    items = [{"name": "hammer", "description": "claw hammer"}]
+
+    assert cache.check_cache(key) is None
+    print("✅ Miss on empty cache")
+
+    cache.save_to_cache(key, items)
+    assert cache.check_cache(key) == items
+    print("✅ Hit after save")
+
+    # Different prompt versions must not share entries
+    other_key = image_cache_key(b"fake image bytes", version="v2")
+    assert other_key != key
+    assert cache.check_cache(other_key) is None
+    print("✅ Prompt version is part of the key")
+
+    return True
+
+
+def test_cache_eviction_and_ttl():
+    """Test LRU eviction and expiry"""
+    print("🧪 Testing vision cache eviction and TTL...")
+
+    cache = VisionCache(max_entries=2)
+    cache.save_to_cache("a", [])
+    cache.save_to_cache("b", [])
+    cache.check_cache("a")  # Touch 'a' so 'b' is least recently used
+    cache.save_to_cache("c", [])
+
+    assert cache.check_cache("a") == []
+    assert cache.check_cache("b") is None
+    assert cache.check_cache("c") == []
+    print("✅ Least recently used entry evicted")
+
+    expired_cache = VisionCache(ttl_seconds=-1)
+    expired_cache.save_to_cache("a", [])
+    assert expired_cache.check_cache("a") is None
+    print("✅ Expired entry ignored")
+
+    return True
+
+
+if __name__ == "__main__":
+    print("🧪 Testing vision cache...")
+    print("=" * 50)
+
+    try:
+        test_cache_hit_and_miss()
+        print()
+        test_cache_eviction_and_ttl()
+
+        print("\n" + "=" * 50)
+        print("🎉 All vision cache tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,46 @@
+"""
+Shared image preprocessing helpers for BinBot
+"""
+
+from PIL import Image
+
+
+def resize_to_fit(image: Image.Image, max_side: int) -> Image.Image:
+    """Downscale an image so its longest side is at most max_side"""
+    if max(image.size) <= max_side:
+        return image
+
+    # Let libjpeg decode large JPEGs straight at 1/2, 1/4 or 1/8 scale so the
+    # full-size image is never held in memory (no-op if already decoded)
+    if image.format == 'JPEG':
+        image.draft('RGB', (max_side, max_side))
+
+    ratio = max_side / max(image.size)
+    new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
+    # BOX is area averaging: for pure downscales it matches LANCZOS quality
+    # closely and is several times faster on large camera photos
+    return image.resize(new_size, Image.Resampling.BOX)
+
+
+def flatten_image(image: Image.Image) -> Image.Image:
+    """Convert an image to RGB or L for JPEG/WebP encoding, putting transparent areas on white"""
+    # Palette images without a transparent entry are plain RGB
+    if image.mode == 'P' and 'transparency' not in image.info:
+        return image.convert('RGB')
+    if image.mode == 'P':
+        image = image.convert('RGBA')
+
+    if image.mode in ('RGBA', 'LA'):
+        if image.getchannel('A').getextrema() == (255, 255):
+            # Fully opaque: just drop the alpha channel
+            return image.convert('RGB' if image.mode == 'RGBA' else 'L')
+
+        # Create a white background for transparent images
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+
+    if image.mode not in ('RGB', 'L'):
+        # Convert any other modes to RGB
+        return image.convert('RGB')
+    return image
@@ -6,7 +6,6 @@ Provides consistent logging setup across all modules
 import logging
 import os
 import sys
-from datetime import datetime
 from typing import Optional
 
 
@@ -105,6 +104,10 @@ def log_function_call(logger: logging.Logger, func_name: str, *args, **kwargs):
         *args: Positional arguments
         **kwargs: Keyword arguments
     """
+    # Building reprs of every argument is wasted work when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     args_str = ', '.join([repr(arg) for arg in args])
     kwargs_str = ', '.join([f"{k}={repr(v)}" for k, v in kwargs.items()])
     
@@ -114,7 +117,7 @@ def log_function_call(logger: logging.Logger, func_name: str, *args, **kwargs):
     if kwargs_str:
         all_args.append(kwargs_str)
     
-    logger.info(f"CALL {func_name}({', '.join(all_args)})")
+    logger.info("CALL %s(%s)", func_name, ', '.join(all_args))
 
 
 def log_function_result(logger: logging.Logger, func_name: str, result: any, success: bool = True):